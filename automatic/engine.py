@@ -1,30 +1,91 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, Iterator
 import random
 import math
 import heapq
-
-
-@dataclass
+from array import array
+from collections import deque
+from itertools import accumulate
+
+
+# Коды событий лога. Запись лога — кортеж (code, t, a, b, c),
+# смысл полей a, b, c зависит от кода (см. LOG_FIELDS).
+(
+    LOG_ARRIVAL,
+    LOG_ASSIGN,
+    LOG_EVICT,
+    LOG_ENQUEUE,
+    LOG_PICK,
+    LOG_PACKET,
+    LOG_SERVICE_START,
+    LOG_SERVICE_COMPLETE,
+) = range(8)
+
+LOG_EVTYPE = (
+    "ARRIVAL",
+    "ASSIGN_TO_DEVICE",
+    "BUFFER_EVICT",
+    "BUFFER_ENQUEUE",
+    "BUFFER_PICK",
+    "PACKET_FORMED",
+    "SERVICE_START",
+    "SERVICE_COMPLETE",
+)
+
+LOG_FIELDS = (
+    ("post", "source"),
+    ("post", "source", "device"),
+    ("post", "source"),
+    ("post", "source"),
+    ("post", "source"),
+    ("post", "source", "packet_size"),
+    ("post", "source", "device"),
+    ("post", "source", "device"),
+)
+
+
+@dataclass(slots=True)
 class Post:
     id: int
     source_id: int
     created_at: float
 
 
+# Сколько случайных величин закона генерируется за одну пачку
+VARIATE_CHUNK = 4096
+
+
 class InterarrivalLaw:
     def next_delay(self) -> float:
         raise NotImplementedError
 
+    def next_delays(self, n: int) -> List[float]:
+        return [self.next_delay() for _ in range(n)]
+
 
 class UniformInterarrival(InterarrivalLaw):
-    def __init__(self, a: float, b: float):
+    def __init__(self, a: float, b: float, rng: random.Random):
         self.a = a
         self.b = b
+        self._rng = rng
+        self._random = rng.random
+        self._buf: List[float] = []
+
+    def _refill(self):
+        a, w = self.a, self.b - self.a
+        rnd = self._random
+        self._buf = [a + w * rnd() for _ in range(VARIATE_CHUNK)]
 
     def next_delay(self) -> float:
-        return random.uniform(self.a, self.b)
+        if not self._buf:
+            self._refill()
+        return self._buf.pop()
+
+    def next_delays(self, n: int) -> List[float]:
+        a, w = self.a, self.b - self.a
+        rnd = self._random
+        return [a + w * rnd() for _ in range(n)]
 
 
 class ServiceLaw:
@@ -33,78 +94,142 @@ class ServiceLaw:
 
 
 class ExponentialService(ServiceLaw):
-    def __init__(self, lambd: float):
+    def __init__(self, lambd: float, rng: random.Random):
+        if lambd <= 0:
+            raise ValueError("Интенсивность λ должна быть > 0")
         self.lambd = lambd
+        self._inv = 1.0 / lambd
+        self._rng = rng
+        self._random = rng.random
+        self._buf: List[float] = []
 
-    def next_service_time(self) -> float:
-        u = random.random()
-        return -math.log(1 - u) / self.lambd if self.lambd > 0 else 0.0
-
+    def _refill(self):
+        inv = self._inv
+        rnd, log1p = self._random, math.log1p
+        self._buf = [-log1p(-rnd()) * inv for _ in range(VARIATE_CHUNK)]
 
-@dataclass
-class BufferSlot:
-    post: Optional[Post] = None
-    enqueued_at: float = 0.0
+    def next_service_time(self) -> float:
+        if not self._buf:
+            self._refill()
+        return self._buf.pop()
 
 
 class Buffer:
     def __init__(self, capacity: int):
         self.capacity = capacity
-        self.slots: List[BufferSlot] = [BufferSlot() for _ in range(capacity)]
         self.last_index: int = -1
         self.size: int = 0
 
+        # Слоты хранятся по полям (SoA): i-й элемент каждого массива относится к слоту i
+        self._used = bytearray(capacity)
+        self._post_id = array("q", [0]) * capacity
+        self._src_id = array("q", [0]) * capacity
+        self._created = array("d", [0.0]) * capacity
+        self._enq = array("d", [0.0]) * capacity
+        self._slot_gen = array("q", [0]) * capacity
+
+        # Индексы для O(log C): маска свободных слотов (бит i = слот i свободен)
+        # и две кучи (t, idx, gen) с ленивым удалением устаревших записей.
+        self._free_mask: int = (1 << capacity) - 1
+        self._by_time_min: List[Tuple[float, int, int]] = []
+        self._by_time_max: List[Tuple[float, int, int]] = []
+        self._gen: int = 0
+
     def is_full(self) -> bool:
         return self.size == self.capacity
 
     def is_empty(self) -> bool:
         return self.size == 0
 
+    def _next_free(self) -> int:
+        # Ближайший свободный слот по кольцу, начиная с last_index + 1
+        start = (self.last_index + 1) % self.capacity
+        m = self._free_mask >> start
+        if m:
+            return start + (m & -m).bit_length() - 1
+        m = self._free_mask
+        return (m & -m).bit_length() - 1
+
+    def _take(self, idx: int) -> Post:
+        post = Post(self._post_id[idx], self._src_id[idx], self._created[idx])
+        self._used[idx] = 0
+        self._enq[idx] = 0.0
+        self._free_mask |= 1 << idx
+        self.size -= 1
+        return post
+
+    def _pop_live(self, heap: List[Tuple[float, int, int]]) -> int:
+        used, slot_gen = self._used, self._slot_gen
+        while heap:
+            _, idx, gen = heapq.heappop(heap)
+            if used[idx] and slot_gen[idx] == gen:
+                return idx
+        return -1
+
+    def _compact(self):
+        enq, slot_gen = self._enq, self._slot_gen
+        self._by_time_min = [(enq[i], i, slot_gen[i])
+                             for i, u in enumerate(self._used) if u]
+        self._by_time_max = [(-t, i, g) for t, i, g in self._by_time_min]
+        heapq.heapify(self._by_time_min)
+        heapq.heapify(self._by_time_max)
+
     def enqueue_d1031(self, post: Post, now: float) -> bool:
         if self.is_full():
             return False
-        start = (self.last_index + 1) % self.capacity
-        idx = start
-        for _ in range(self.capacity):
-            if self.slots[idx].post is None:
-                self.slots[idx].post = post
-                self.slots[idx].enqueued_at = now
-                self.last_index = idx
-                self.size += 1
-                return True
-            idx = (idx + 1) % self.capacity
-        return False
+        idx = self._next_free()
+        self._free_mask &= ~(1 << idx)
+        self.size += 1
+        self._put(idx, post, now)
+        return True
+
+    def _put(self, idx: int, post: Post, now: float):
+        self._gen += 1
+        self._used[idx] = 1
+        self._post_id[idx] = post.id
+        self._src_id[idx] = post.source_id
+        self._created[idx] = post.created_at
+        self._enq[idx] = now
+        self._slot_gen[idx] = self._gen
+        self.last_index = idx
+
+        if len(self._by_time_min) + len(self._by_time_max) > 4 * self.capacity:
+            self._compact()
+        else:
+            heapq.heappush(self._by_time_min, (now, idx, self._gen))
+            heapq.heappush(self._by_time_max, (-now, idx, self._gen))
 
     def drop_oldest_d10o3(self) -> Optional[Post]:
-        oldest_t = float("inf")
-        oldest_idx = -1
-        for i, s in enumerate(self.slots):
-            if s.post and s.enqueued_at < oldest_t:
-                oldest_t = s.enqueued_at
-                oldest_idx = i
-        if oldest_idx == -1:
+        idx = self._pop_live(self._by_time_min)
+        if idx == -1:
             return None
-        dropped = self.slots[oldest_idx].post
-        self.slots[oldest_idx] = BufferSlot()
-        self.size -= 1
+        return self._take(idx)
+
+    def replace_oldest(self, post: Post, now: float) -> Optional[Post]:
+        # D10O3 + D1031 за один проход: новая заявка занимает слот выбитой
+        idx = self._pop_live(self._by_time_min)
+        if idx == -1:
+            return None
+        dropped = Post(self._post_id[idx], self._src_id[idx], self._created[idx])
+        self._put(idx, post, now)
         return dropped
 
     def pick_lifo_d2b2(self) -> Optional[Post]:
-        newest_t = -1.0
-        newest_idx = -1
-        for i, s in enumerate(self.slots):
-            if s.post and s.enqueued_at > newest_t:
-                newest_t = s.enqueued_at
-                newest_idx = i
-        if newest_idx == -1:
+        idx = self._pop_live(self._by_time_max)
+        if idx == -1:
             return None
-        post = self.slots[newest_idx].post
-        self.slots[newest_idx] = BufferSlot()
-        self.size -= 1
-        return post
+        return self._take(idx)
+
+    def drain_matching(self, source_id: int) -> List[Post]:
+        # Все заявки источника от новых к старым, в том же порядке, что и при LIFO-выборке
+        used, src_id = self._used, self._src_id
+        idxs = [i for i in range(self.capacity) if used[i] and src_id[i] == source_id]
+        idxs.sort(key=self._enq.__getitem__, reverse=True)
+        return [self._take(i) for i in idxs]
 
     def list_state(self):
-        return [(i, s.post.id if s.post else None, s.enqueued_at) for i, s in enumerate(self.slots)]
+        return [(i, pid if u else None, t)
+                for i, (u, pid, t) in enumerate(zip(self._used, self._post_id, self._enq))]
 
 
 class Device:
@@ -113,6 +238,7 @@ class Device:
         self.service_law = service_law
         self.busy = False
         self.current_post: Optional[Post] = None
+        self._pool: Optional[DevicePool] = None
 
     def is_free(self) -> bool:
         return not self.busy
@@ -120,12 +246,16 @@ class Device:
     def start_process(self, post: Post) -> float:
         self.busy = True
         self.current_post = post
+        if self._pool is not None:
+            self._pool._free_mask &= ~(1 << self.id)
         return self.service_law.next_service_time()
 
     def complete(self) -> Optional[Post]:
         self.busy = False
         p = self.current_post
         self.current_post = None
+        if self._pool is not None:
+            self._pool._free_mask |= 1 << self.id
         return p
 
 
@@ -134,81 +264,228 @@ class DevicePool:
         self.devices = devices
         self.cursor = 0
 
+        # Бит i = прибор i свободен; приборы сами обновляют маску
+        self._all_mask = (1 << len(devices)) - 1
+        self._free_mask = 0
+        for d in devices:
+            d._pool = self
+            if d.is_free():
+                self._free_mask |= 1 << d.id
+
     def pick_cyclic_d2p2(self) -> Optional[Device]:
+        free = self._free_mask
+        if not free:
+            return None
         n = len(self.devices)
-        for k in range(n):
-            i = (self.cursor + k) % n
-            if self.devices[i].is_free():
-                self.cursor = (i + 1) % n
-                return self.devices[i]
-        return None
+        c = self.cursor
+        # Поворачиваем маску так, чтобы бит 0 соответствовал прибору cursor
+        m = ((free >> c) | (free << (n - c))) & self._all_mask
+        i = (c + (m & -m).bit_length() - 1) % n
+        self.cursor = (i + 1) % n
+        return self.devices[i]
 
     def any_free(self) -> bool:
-        return any(d.is_free() for d in self.devices)
+        return self._free_mask != 0
 
 
 class SimulationCore:
+    __slots__ = (
+        "current_time", "calendar", "_seq",
+        "buffer", "pool", "_has_completion",
+        "inter_arrival", "service", "params",
+        "next_post_id", "_arrivals",
+        "n_generated", "n_queued", "n_served", "n_evicted", "n_direct",
+        "log_enabled", "log_output", "log_total",
+        "placement", "selection",
+    )
+
     def __init__(self, params: Dict[str, Any]):
-        random.seed(params["seed"])
+        # Каждый закон получает свой поток случайных чисел, сиды потоков
+        # выводятся из params["seed"], поэтому прогон по-прежнему воспроизводим
+        seeder = random.Random(params["seed"])
+
+        def stream() -> random.Random:
+            return random.Random(seeder.getrandbits(64))
 
         self.current_time: float = 0.0
-        self.calendar: List[Event] = []
+        self.calendar: List[Tuple[float, int, int, int]] = []
+        self._seq: int = 0
 
         self.buffer = Buffer(params["buffer"])
-        self.pool = DevicePool([Device(i, ExponentialService(params["lambda"]))
+        self.pool = DevicePool([Device(i, ExponentialService(params["lambda"], stream()))
                                 for i in range(params["devices"])])
 
-        self.inter_arrival = UniformInterarrival(*params["i32"])
-        self.service = ExponentialService(params["lambda"])
+        # _has_completion[i] == 1, пока в календаре есть завершение прибора i
+        self._has_completion = bytearray(len(self.pool.devices))
+
+        self.inter_arrival = UniformInterarrival(*params["i32"], stream())
+        self.service = ExponentialService(params["lambda"], stream())
 
         self.params = params
         self.next_post_id = 1
 
-        self.stats: Dict[str, float] = dict(
-            generated=0,
-            queued=0,
-            served=0,
-            evicted=0,
-            direct=0,
-        )
+        # Поток абсолютных времён следующих заявок для каждого источника
+        self._arrivals: Dict[int, Iterator[float]] = {}
 
-        self.log_output: List[Any] = []
+        # Счётчики статистики; словарь для GUI собирает snapshot_stats()
+        self.n_generated: int = 0
+        self.n_queued: int = 0
+        self.n_served: int = 0
+        self.n_evicted: int = 0
+        self.n_direct: int = 0
+
+        # В автоматическом режиме лог не нужен: вызовы log() пропускаются целиком
+        self.log_enabled: bool = params.get("log_enabled", True)
+        # log_output_limit ограничивает число хранимых записей (None — без ограничения),
+        # log_total считает все записи, в том числе уже вытесненные из log_output
+        self.log_output: deque[Tuple[int, float, Any, Any, Any]] = deque(
+            maxlen=params.get("log_output_limit"))
+        self.log_total: int = 0
 
         self.placement = PlacementDispatcher(self.buffer, self.pool,
                                              direct_assign=params["direct"],
                                              sim=self)
         self.selection = SelectionDispatcher(self.buffer, self.pool, sim=self)
 
-    def log(self, evtype: str, data: Dict[str, Any]):
-        self.log_output.append((evtype, self.current_time, data))
+    def log(self, code: int, a: Any = None, b: Any = None, c: Any = None):
+        self.log_output.append((code, self.current_time, a, b, c))
+        self.log_total += 1
+
+    def snapshot_stats(self) -> Dict[str, int]:
+        return dict(
+            generated=self.n_generated,
+            queued=self.n_queued,
+            served=self.n_served,
+            evicted=self.n_evicted,
+            direct=self.n_direct,
+        )
+
+    def schedule(self, time: float, kind: int, arg: int):
+        self._seq += 1
+        heapq.heappush(self.calendar, (time, self._seq, kind, arg))
+
+    def schedule_completion(self, dev_id: int, time: float):
+        self._has_completion[dev_id] = 1
+        self.schedule(time, KIND_COMPLETION, dev_id)
 
-    def schedule(self, ev: "Event"):
-        heapq.heappush(self.calendar, ev)
+    def _arrival_stream(self, start: float) -> Iterator[float]:
+        # Времена прихода считаются пачкой накопленных сумм интервалов
+        t = start
+        while True:
+            times = list(accumulate(self.inter_arrival.next_delays(VARIATE_CHUNK), initial=t))
+            yield from times[1:]
+            t = times[-1]
 
     def bootstrap(self):
         for s in range(1, self.params["sources"] + 1):
-            self.schedule(ArrivalEvent(0.0, s))
+            self._arrivals[s] = self._arrival_stream(0.0)
+            self.schedule(0.0, KIND_ARRIVAL, s)
 
     def step(self) -> bool:
         if not self.calendar:
             return False
-        ev = heapq.heappop(self.calendar)
-        ev.process(self)
+        time, _, kind, arg = heapq.heappop(self.calendar)
+        DISPATCH[kind](self, time, arg)
         return True
 
     def run_automatic(self, max_steps: int = 100000, max_time: float = 9999.0):
         self.log_output.clear()
-        steps = 0
-        while self.calendar and steps < max_steps:
-            ev = heapq.heappop(self.calendar)
-            if ev.time > max_time:
-                break
-            ev.process(self)
-            steps += 1
+        if self.log_enabled:
+            self._run_dispatch(max_steps, max_time)
+        else:
+            self._run_fast(max_steps, max_time)
         return self.summary()
 
+    def _run_dispatch(self, max_steps: int, max_time: float):
+        calendar = self.calendar
+        heappop = heapq.heappop
+        for _ in range(max_steps):
+            if not calendar:
+                break
+            time, _, kind, arg = heappop(calendar)
+            if time > max_time:
+                break
+            DISPATCH[kind](self, time, arg)
+
+    def _run_fast(self, max_steps: int, max_time: float):
+        # Те же шаги, что в _process_arrival/_process_completion, развёрнутые в один
+        # цикл без лога: постановка в буфер и планирование событий идут напрямую,
+        # счётчики и seq живут в локальных переменных и записываются в конце.
+        calendar = self.calendar
+        heappop, heappush = heapq.heappop, heapq.heappush
+        buffer, pool = self.buffer, self.pool
+        devices = pool.devices
+        has_completion = self._has_completion
+        arrivals = self._arrivals
+        next_service = self.service.next_service_time
+        on_device_freed = self.selection.on_device_freed
+        direct = self.placement._direct
+
+        seq = self._seq
+        post_id = self.next_post_id
+        now = self.current_time
+        generated = queued = served = evicted = direct_count = 0
+
+        for _ in range(max_steps):
+            if not calendar:
+                break
+            time, _, kind, arg = heappop(calendar)
+            if time > max_time:
+                break
+            now = time
+
+            if kind == KIND_ARRIVAL:
+                post = Post(post_id, arg, time)
+                post_id += 1
+                generated += 1
+
+                assigned: Optional[Device] = None
+                if direct:
+                    assigned = pool.pick_cyclic_d2p2()
+                    if assigned:
+                        assigned.start_process(post)
+                        direct_count += 1
+                if assigned is None:
+                    if buffer.is_full():
+                        if buffer.replace_oldest(post, time) is not None:
+                            evicted += 1
+                            queued += 1
+                    elif buffer.enqueue_d1031(post, time):
+                        queued += 1
+
+                seq += 1
+                heappush(calendar, (next(arrivals[arg]), seq, KIND_ARRIVAL, arg))
+
+                if assigned is not None:
+                    has_completion[assigned.id] = 1
+                    seq += 1
+                    heappush(calendar, (time + next_service(), seq, KIND_COMPLETION, assigned.id))
+
+                if direct or buffer.is_empty() or not pool.any_free():
+                    continue
+            else:
+                has_completion[arg] = 0
+                if devices[arg].complete():
+                    served += 1
+
+            on_device_freed(time)
+            for d in devices:
+                if d.busy and not has_completion[d.id]:
+                    has_completion[d.id] = 1
+                    seq += 1
+                    heappush(calendar, (time + next_service(), seq, KIND_COMPLETION, d.id))
+
+        self._seq = seq
+        self.next_post_id = post_id
+        self.current_time = now
+        self.n_generated += generated
+        self.n_queued += queued
+        self.n_served += served
+        self.n_evicted += evicted
+        self.n_direct += direct_count
+
     def summary(self) -> Dict[str, float]:
-        st = self.stats
+        st = self.snapshot_stats()
         reject_pct = (st["evicted"] / st["generated"] * 100.0) if st["generated"] > 0 else 0.0
 
         return dict(
@@ -223,7 +500,7 @@ class SimulationCore:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class AcceptedResult:
     status: int
     queued: bool
@@ -231,7 +508,7 @@ class AcceptedResult:
     assigned_device_id: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Packet:
     source_id: int
     posts: List[Post]
@@ -249,31 +526,25 @@ class PlacementDispatcher:
             dev = self._pool.pick_cyclic_d2p2()
             if dev:
                 dev.start_process(post)
-                self._sim.stats["direct"] += 1
-                self._sim.log("ASSIGN_TO_DEVICE", {
-                    "post": post.id,
-                    "source": post.source_id,
-                    "device": dev.id,
-                })
+                self._sim.n_direct += 1
+                if self._sim.log_enabled:
+                    self._sim.log(LOG_ASSIGN, post.id, post.source_id, dev.id)
                 return AcceptedResult(202, False, assigned_device_id=dev.id)
 
         evicted_id: Optional[int] = None
         if self._buffer.is_full():
-            dropped = self._buffer.drop_oldest_d10o3()
+            dropped = self._buffer.replace_oldest(post, now)
+            ok = dropped is not None
             if dropped:
                 evicted_id = dropped.id
-                self._sim.stats["evicted"] += 1
-                self._sim.log("BUFFER_EVICT", {
-                    "post": dropped.id,
-                    "source": dropped.source_id,
-                })
-
-        ok = self._buffer.enqueue_d1031(post, now)
-        if ok:
-            self._sim.log("BUFFER_ENQUEUE", {
-                "post": post.id,
-                "source": post.source_id,
-            })
+                self._sim.n_evicted += 1
+                if self._sim.log_enabled:
+                    self._sim.log(LOG_EVICT, dropped.id, dropped.source_id)
+        else:
+            ok = self._buffer.enqueue_d1031(post, now)
+
+        if ok and self._sim.log_enabled:
+            self._sim.log(LOG_ENQUEUE, post.id, post.source_id, self._buffer.last_index)
 
         return AcceptedResult(202 if ok else 500, ok, evicted_post_id=evicted_id)
 
@@ -291,37 +562,17 @@ class SelectionDispatcher:
             if first is None:
                 return
 
-            self._sim.log("BUFFER_PICK", {
-                "post": first.id,
-                "source": first.source_id,
-            })
+            if self._sim.log_enabled:
+                self._sim.log(LOG_PICK, first.id, first.source_id)
 
+            # Остальные заявки того же источника забираются за один проход,
+            # заявки других источников остаются в своих слотах
             src = first.source_id
-            pulled = [first]
-
-            while not self._buffer.is_empty():
-                p = self._buffer.pick_lifo_d2b2()
-                if p is None:
-                    break
-                pulled.append(p)
-
-            same = [p for p in pulled if p.source_id == src]
-            other = [p for p in pulled if p.source_id != src]
-
-            t = now
-            for p in reversed(other):
-                self._buffer.enqueue_d1031(p, t)
-                self._sim.log("BUFFER_ENQUEUE", {
-                    "post": p.id,
-                    "source": p.source_id,
-                })
-                t += 1e-6
+            same = [first] + self._buffer.drain_matching(src)
 
             self._packet = Packet(src, same)
-            self._sim.log("PACKET_FORMED", {
-                "source": src,
-                "packet_size": len(same),
-            })
+            if self._sim.log_enabled:
+                self._sim.log(LOG_PACKET, same[-1].id if same else None, src, len(same))
 
         while self._packet and self._packet.posts:
             dev = self._pool.pick_cyclic_d2p2()
@@ -329,99 +580,69 @@ class SelectionDispatcher:
                 break
             post = self._packet.posts.pop()
             dev.start_process(post)
-            self._sim.log("SERVICE_START", {
-                "post": post.id,
-                "source": post.source_id,
-                "device": dev.id,
-            })
+            if self._sim.log_enabled:
+                self._sim.log(LOG_SERVICE_START, post.id, post.source_id, dev.id)
 
         if self._packet and not self._packet.posts:
             self._packet = None
 
 
-class Event:
-    def __init__(self, time: float):
-        self.time = time
-
-    def __lt__(self, other: "Event"):
-        return self.time < other.time
-
-    def process(self, sim: SimulationCore):
-        raise NotImplementedError
+# Событие календаря — кортеж (time, seq, kind, arg): seq разрешает равные
+# времена в порядке планирования, arg — номер источника или прибора.
+KIND_ARRIVAL, KIND_COMPLETION = 0, 1
 
 
-class ArrivalEvent(Event):
-    def __init__(self, time: float, source: int):
-        super().__init__(time)
-        self.source = source
+def _process_arrival(sim: SimulationCore, time: float, source: int):
+    sim.current_time = time
 
-    def process(self, sim: SimulationCore):
-        sim.current_time = self.time
+    post = Post(sim.next_post_id, source, time)
+    sim.next_post_id += 1
+    sim.n_generated += 1
 
-        post = Post(sim.next_post_id, self.source, self.time)
-        sim.next_post_id += 1
-        sim.stats["generated"] += 1
+    if sim.log_enabled:
+        sim.log(LOG_ARRIVAL, post.id, post.source_id)
 
-        sim.log("ARRIVAL", {
-            "post": post.id,
-            "source": post.source_id,
-        })
+    res = sim.placement.handle_publish(post, time)
 
-        res = sim.placement.handle_publish(post, self.time)
+    if res.queued:
+        sim.n_queued += 1
 
-        if res.queued:
-            sim.stats["queued"] += 1
+    sim.schedule(next(sim._arrivals[source]), KIND_ARRIVAL, source)
 
-        delay = sim.inter_arrival.next_delay()
-        sim.schedule(ArrivalEvent(self.time + delay, self.source))
+    if res.assigned_device_id is not None:
+        device = sim.pool.devices[res.assigned_device_id]
+        t = sim.service.next_service_time()
+        sim.schedule_completion(device.id, time + t)
 
-        if res.assigned_device_id is not None:
-            device = sim.pool.devices[res.assigned_device_id]
-            t = sim.service.next_service_time()
-            sim.schedule(CompletionEvent(self.time + t, device.id))
+    if (not sim.placement._direct) and (not sim.buffer.is_empty()) and sim.pool.any_free():
+        sim.selection.on_device_freed(time)
+        for d in sim.pool.devices:
+            if d.busy and not sim._has_completion[d.id]:
+                t_serv = sim.service.next_service_time()
+                sim.schedule_completion(d.id, time + t_serv)
 
-        if (not sim.placement._direct) and (not sim.buffer.is_empty()) and sim.pool.any_free():
-            sim.selection.on_device_freed(self.time)
-            for d in sim.pool.devices:
-                if d.busy:
-                    need = True
-                    for ev in sim.calendar:
-                        if isinstance(ev, CompletionEvent) and ev.dev_id == d.id:
-                            need = False
-                            break
-                    if need:
-                        t_serv = sim.service.next_service_time()
-                        sim.schedule(CompletionEvent(self.time + t_serv, d.id))
 
+def _process_completion(sim: SimulationCore, time: float, dev_id: int):
+    sim.current_time = time
+    sim._has_completion[dev_id] = 0
+    dev = sim.pool.devices[dev_id]
+    post = dev.complete()
 
-class CompletionEvent(Event):
-    def __init__(self, time: float, dev_id: int):
-        super().__init__(time)
-        self.dev_id = dev_id
+    if post:
+        sim.n_served += 1
 
-    def process(self, sim: SimulationCore):
-        sim.current_time = self.time
-        dev = sim.pool.devices[self.dev_id]
-        post = dev.complete()
+    if sim.log_enabled:
+        sim.log(LOG_SERVICE_COMPLETE,
+                post.id if post else None,
+                post.source_id if post else None,
+                dev_id)
 
-        if post:
-            sim.stats["served"] += 1
+    sim.selection.on_device_freed(time)
 
-        sim.log("SERVICE_COMPLETE", {
-            "post": post.id if post else None,
-            "source": post.source_id if post else None,
-            "device": self.dev_id,
-        })
+    for d in sim.pool.devices:
+        if d.busy and not sim._has_completion[d.id]:
+            t_serv = sim.service.next_service_time()
+            sim.schedule_completion(d.id, time + t_serv)
 
-        sim.selection.on_device_freed(self.time)
 
-        for d in sim.pool.devices:
-            if d.busy:
-                need = True
-                for ev in sim.calendar:
-                    if isinstance(ev, CompletionEvent) and ev.dev_id == d.id:
-                        need = False
-                        break
-                if need:
-                    t_serv = sim.service.next_service_time()
-                    sim.schedule(CompletionEvent(self.time + t_serv, d.id))
+DISPATCH = (_process_arrival, _process_completion)
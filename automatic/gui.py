@@ -4,6 +4,7 @@ from tkinter import ttk, messagebox
 from typing import Optional
 
 from engine import SimulationCore
+from engine_util import parse_params
 
 # Дефолтные параметры
 
@@ -16,6 +17,8 @@ DEFAULT_PARAMS = {
     "steps": 50000,  # Количество шагов по кнопке "N шагов"
     "direct": False,  # Прямая постановка
     "seed": 42,  # Сид для воспроизведения тех же результатов в любое время
+    "log_enabled": False,  # Подробный лог событий (в автоматическом режиме не нужен)
+    "log_output_limit": 0,  # Записи лога не хранятся
 }
 
 
@@ -87,32 +90,13 @@ class App:
 
     def read_params(self) -> bool:
         try:
-            buffer_size = int(self.inputs["buffer"].get())
-            devices = int(self.inputs["devices"].get())
-            sources = int(self.inputs["sources"].get())
-
-            raw_range = self.inputs["i32_range"].get()
-            parts = raw_range.split(",")
-            if len(parts) != 2:
-                raise ValueError("Интервал генерации должен быть вида min,max")
-
-            i_min = float(parts[0].strip())
-            i_max = float(parts[1].strip())
-            if i_min <= 0 or i_max <= 0 or i_min >= i_max:
-                raise ValueError("Интервал генерации: 0 < min < max")
-
-            lam = float(self.inputs["lambda"].get())
-            steps = int(self.inputs["steps"].get())
-
+            raw = {key: ent.get() for key, ent in self.inputs.items()}
             self.params = {
-                "buffer": buffer_size,
-                "devices": devices,
-                "sources": sources,
-                "i32": (i_min, i_max),
-                "lambda": lam,
-                "steps": steps,
+                **parse_params(raw),
                 "direct": self.chk_direct.get(),
                 "seed": DEFAULT_PARAMS["seed"],
+                "log_enabled": DEFAULT_PARAMS["log_enabled"],
+                "log_output_limit": DEFAULT_PARAMS["log_output_limit"],
             }
             return True
 
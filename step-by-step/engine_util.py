@@ -0,0 +1,31 @@
+from __future__ import annotations
+from functools import lru_cache
+from typing import Any, Dict, Tuple
+
+
+@lru_cache(maxsize=16)
+def parse_range(raw: str) -> Tuple[float, float]:
+    i_min, sep, i_max = raw.partition(",")
+    if not sep or "," in i_max:
+        raise ValueError("Интервал генерации должен быть вида min,max")
+
+    lo, hi = float(i_min), float(i_max)
+    if lo <= 0 or hi <= 0 or lo >= hi:
+        raise ValueError("Интервал генерации: 0 < min < max")
+    return lo, hi
+
+
+def parse_params(raw: Dict[str, str]) -> Dict[str, Any]:
+    # Поля ввода GUI -> параметры SimulationCore (без флагов и сида)
+    lam = float(raw["lambda"])
+    if lam <= 0:
+        raise ValueError("Интенсивность λ должна быть > 0")
+
+    return {
+        "buffer": int(raw["buffer"]),
+        "devices": int(raw["devices"]),
+        "sources": int(raw["sources"]),
+        "i32": parse_range(raw["i32_range"]),
+        "lambda": lam,
+        "steps": int(raw["steps"]),
+    }
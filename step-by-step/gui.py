@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import tkinter as tk
+from itertools import islice
 from tkinter import ttk, scrolledtext, messagebox
 from typing import Optional
 
-from engine import SimulationCore
+from engine import SimulationCore, describe_log
+from engine_util import parse_params
 
 # Дефолтные параметры
 
@@ -17,8 +19,13 @@ DEFAULT_PARAMS = {
     "steps": 40,  # Количество шагов по кнопке "N шагов"
     "direct": False,  # Прямая постановка
     "seed": 42,  # Сид для воспроизведения тех же результатов в любое время
+    "log_enabled": True,  # Подробный лог событий для календаря
+    "log_output_limit": 10_000,  # Сколько последних записей лога хранить
 }
 
+# Сколько последних строк держать в календаре событий
+MAX_CALENDAR_ROWS = 2000
+
 
 # Оболочка приложения
 
@@ -113,11 +120,11 @@ class App:
         self.calendar.column("last_idx", width=110, anchor="center")
         self.calendar.column("reject_pct", width=90, anchor="center")
 
-        cal_scroll = ttk.Scrollbar(calendar_frame, orient="vertical", command=self.calendar.yview)
-        self.calendar.configure(yscrollcommand=cal_scroll.set)
+        self.cal_scroll = ttk.Scrollbar(calendar_frame, orient="vertical", command=self.calendar.yview)
+        self.calendar.configure(yscrollcommand=self.cal_scroll.set)
 
         self.calendar.pack(side="left", fill="both", expand=True)
-        cal_scroll.pack(side="right", fill="y")
+        self.cal_scroll.pack(side="right", fill="y")
 
         # Логи
 
@@ -128,32 +135,13 @@ class App:
 
     def read_params(self) -> bool:
         try:
-            buffer_size = int(self.inputs["buffer"].get())
-            devices = int(self.inputs["devices"].get())
-            sources = int(self.inputs["sources"].get())
-
-            raw_range = self.inputs["i32_range"].get()
-            parts = raw_range.split(",")
-            if len(parts) != 2:
-                raise ValueError("Интервал генерации: min,max")
-
-            i_min = float(parts[0].strip())
-            i_max = float(parts[1].strip())
-            if i_min <= 0 or i_max <= 0 or i_min >= i_max:
-                raise ValueError("Интервал генерации: 0 < min < max")
-
-            lam = float(self.inputs["lambda"].get())
-            steps = int(self.inputs["steps"].get())
-
+            raw = {key: ent.get() for key, ent in self.inputs.items()}
             self.params = {
-                "buffer": buffer_size,
-                "devices": devices,
-                "sources": sources,
-                "i32": (i_min, i_max),
-                "lambda": lam,
-                "steps": steps,
+                **parse_params(raw),
                 "direct": self.chk_direct.get(),
                 "seed": DEFAULT_PARAMS["seed"],
+                "log_enabled": DEFAULT_PARAMS["log_enabled"],
+                "log_output_limit": DEFAULT_PARAMS["log_output_limit"],
             }
             return True
         except Exception as e:
@@ -196,11 +184,35 @@ class App:
         if not self.sim:
             return
 
-        for i in range(self.last_log_index, len(self.sim.log_output)):
-            evtype, time, data = self.sim.log_output[i]
+        # log_output хранит только последние записи, поэтому новые считаются
+        # по общему счётчику log_total, а не по индексу в списке
+        log = self.sim.log_output
+        fresh = min(self.sim.log_total - self.last_log_index, len(log))
+        self.last_log_index = self.sim.log_total
+        new_entries = list(islice(log, len(log) - fresh, None))
+        if not new_entries:
+            self.out.see(tk.END)
+            return
+
+        # Состояние модели одинаково для всех новых записей: считаем его один раз
+        st = self.sim.snapshot_stats()
+        reject_pct = (st["evicted"] / st["generated"] * 100.0) if st["generated"] > 0 else 0.0
+
+        # Весь текст копится в parts и вставляется в ScrolledText одним вызовом,
+        # а полоса прокрутки календаря отключается на время вставки строк
+        parts: list[str] = []
+        first_row = len(new_entries) - MAX_CALENDAR_ROWS
+        self.calendar.configure(yscrollcommand="")
 
-            st = self.sim.stats
-            reject_pct = (st["evicted"] / st["generated"] * 100.0) if st["generated"] > 0 else 0.0
+        for n, entry in enumerate(new_entries):
+            evtype, time, data = describe_log(entry)
+
+            parts.append(f"\n=== Событие: {evtype} (t={time:.3f}) ===\n")
+            for k, v in data.items():
+                parts.append(f"  {k}: {v}\n")
+
+            if n < first_row:
+                continue
 
             row = (
                 f"{time:.3f}",
@@ -216,31 +228,30 @@ class App:
             )
             self.calendar.insert("", "end", values=row)
 
-            self.out.insert(tk.END, f"\n=== Событие: {evtype} (t={time:.3f}) ===\n")
-            for k, v in data.items():
-                self.out.insert(tk.END, f"  {k}: {v}\n")
-
-            buf_state = self.sim.buffer.list_state()
-            self.out.insert(tk.END, f"Буфер (индекс, заявка, t): {buf_state}\n")
-
-            devs = [
-                f"D{d.id}={'FREE' if d.is_free() else f'BUSY({d.current_post.id})'}"
-                for d in self.sim.pool.devices
-            ]
-            self.out.insert(
-                tk.END,
-                f"Приборы: {devs}, cursor={self.sim.pool.cursor}, "
-                f"last_index={self.sim.buffer.last_index}\n",
-            )
+        rows = self.calendar.get_children()
+        if len(rows) > MAX_CALENDAR_ROWS:
+            self.calendar.delete(*rows[:len(rows) - MAX_CALENDAR_ROWS])
+        self.calendar.configure(yscrollcommand=self.cal_scroll.set)
+
+        buf_state = self.sim.buffer.list_state()
+        parts.append(f"Буфер (индекс, заявка, t): {buf_state}\n")
+
+        devs = [
+            f"D{d.id}={'FREE' if d.is_free() else f'BUSY({d.current_post.id})'}"
+            for d in self.sim.pool.devices
+        ]
+        parts.append(
+            f"Приборы: {devs}, cursor={self.sim.pool.cursor}, "
+            f"last_index={self.sim.buffer.last_index}\n"
+        )
 
-            self.out.insert(
-                tk.END,
-                f"Статистика: gen={st['generated']} queued={st['queued']} "
-                f"served={st['served']} evicted={st['evicted']} direct={st['direct']} "
-                f"({reject_pct:.1f}% отказов)\n",
-            )
+        parts.append(
+            f"Статистика: gen={st['generated']} queued={st['queued']} "
+            f"served={st['served']} evicted={st['evicted']} direct={st['direct']} "
+            f"({reject_pct:.1f}% отказов)\n"
+        )
 
-        self.last_log_index = len(self.sim.log_output)
+        self.out.insert(tk.END, "".join(parts))
         self.out.see(tk.END)
 
 